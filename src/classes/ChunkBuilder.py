@@ -1,12 +1,204 @@
+import io
 import os
+import sys
 import ast
 from pathlib import Path
 import json
 import hashlib
 import time
-from typing import Dict, Set, Tuple, List, Optional
+from bisect import bisect_left
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Set, Tuple, List, Optional, Sequence
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 from .Minifier import Minifier
+from .ModuleCache import ModuleCache, iter_import_nodes
+
+
+# Top-level names of every standard library and builtin module
+STDLIB_MODULES = frozenset(sys.stdlib_module_names) | frozenset(sys.builtin_module_names)
+
+# Sources shorter than this many characters are emitted without minification,
+# since the minifier's parse and transform passes cost more than they save
+MINIFY_MIN_SIZE = 32
+
+# Sources averaging more characters per line than this, with no space-indented
+# lines, are assumed to be minified already
+MINIFIED_LINE_LENGTH = 120
+
+# Chunks with at least this many modules render their bodies in a process pool
+PARALLEL_MIN_MODULES = 16
+
+# Write buffer for chunk files, large enough that most chunks reach the disk
+# in a single write call
+CHUNK_WRITE_BUFFER_SIZE = 1024 * 1024
+
+
+def _needs_minification(source: str) -> bool:
+    """
+    Check whether a source is worth passing through the minifier.
+
+    Tiny sources are skipped, as are sources that already look minified: long
+    average lines and no line indented with four spaces (the minifier indents
+    with tabs). Both checks are single linear passes over the text, much cheaper
+    than the minifier's parse and unparse round-trip.
+
+    Being a heuristic, this also skips unminified modules that are tab-indented
+    or two-space-indented and average over MINIFIED_LINE_LENGTH characters per
+    line, such as a module holding a long one-line data literal.
+
+    Args:
+        source (str): Python source code
+
+    Returns:
+        bool: True if the source should be minified
+    """
+    if len(source) < MINIFY_MIN_SIZE:
+        return False
+    if source.startswith("    ") or "\n    " in source:
+        return True
+    return len(source) <= MINIFIED_LINE_LENGTH * (source.count("\n") + 1)
+
+
+def _insort_unique(lines: List[str], line: str) -> None:
+    """Insert a line into a sorted list unless it is already present."""
+    index = bisect_left(lines, line)
+    if index == len(lines) or lines[index] != line:
+        lines.insert(index, line)
+
+
+# Source of the __load_chunk__ helper emitted at the top of the main chunk
+_LOADER_CODE = """
+def __load_chunk__(name):
+    import importlib.util
+    import sys
+    import os
+    if name in sys.modules:
+        return sys.modules[name]
+    chunk_path = os.path.join(os.path.dirname(__file__), f"{name}.py")
+    spec = importlib.util.spec_from_file_location(name, chunk_path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+    """
+
+
+def _is_main_guard(node: ast.stmt) -> bool:
+    """Check if a statement is an `if __name__ == "__main__":` block."""
+    if type(node) is not ast.If:
+        return False
+
+    test = node.test
+    if (
+        type(test) is not ast.Compare
+        or len(test.ops) != 1
+        or type(test.ops[0]) is not ast.Eq
+    ):
+        return False
+
+    operands = (test.left, test.comparators[0])
+    return any(
+        type(operand) is ast.Name and operand.id == "__name__" for operand in operands
+    ) and any(
+        type(operand) is ast.Constant and operand.value == "__main__"
+        for operand in operands
+    )
+
+
+def _main_block_lines(tree: ast.Module) -> Tuple[Tuple[int, int], ...]:
+    """
+    Find the line spans of top-level `if __name__ == "__main__":` blocks.
+
+    Args:
+        tree (ast.Module): Parsed module
+
+    Returns:
+        Tuple[Tuple[int, int], ...]: First and last line (1-based, inclusive) of each block
+    """
+    return tuple(
+        (node.lineno, node.end_lineno) for node in tree.body if _is_main_guard(node)
+    )
+
+
+def _strip_statements(
+    content: str,
+    import_spans: Sequence[Tuple[int, int, int, int]],
+    main_block_lines: Sequence[Tuple[int, int]],
+) -> str:
+    """
+    Remove import statements and `__main__` blocks from a module's source.
+
+    Top-level imports are deleted; nested ones are replaced with `pass` at the
+    same indentation so the enclosing block stays valid. Imports sharing a line
+    with another statement are left in place.
+
+    Args:
+        content (str): Source code of the module
+        import_spans (Sequence[Tuple[int, int, int, int]]): Start line, start column,
+            end line and end column of each import statement, as reported by ast
+        main_block_lines (Sequence[Tuple[int, int]]): First and last line
+            (1-based, inclusive) of each `__main__` block to remove
+
+    Returns:
+        str: Source code without the given statements
+    """
+    lines: List[Optional[str]] = content.split("\n")
+
+    for first, last in main_block_lines:
+        lines[first - 1 : last] = [None] * (last - first + 1)
+
+    for lineno, col_offset, end_lineno, end_col_offset in import_spans:
+        first_line = lines[lineno - 1]
+        if first_line is None or first_line[:col_offset].strip():
+            continue
+        tail = lines[end_lineno - 1].encode()[end_col_offset:].strip()
+        if tail and not tail.startswith(b"#"):
+            continue
+
+        lines[lineno - 1] = first_line[:col_offset] + "pass" if col_offset else None
+        lines[lineno:end_lineno] = [None] * (end_lineno - lineno)
+
+    return "\n".join(line for line in lines if line is not None)
+
+
+def _render_module(
+    content: str,
+    import_spans: Sequence[Tuple[int, int, int, int]],
+    main_block_lines: Sequence[Tuple[int, int]],
+) -> Tuple[bool, bytes]:
+    """
+    Strip imports (and optionally `__main__` blocks) from a module and minify it.
+
+    Kept at module level so it can be dispatched to worker processes.
+
+    Args:
+        content (str): Source code of the module
+        import_spans (Sequence[Tuple[int, int, int, int]]): Positions of the
+            module's import statements, which are hoisted into the chunk header
+        main_block_lines (Sequence[Tuple[int, int]]): Line spans of `__main__` blocks
+            to drop, empty to keep them
+
+    Returns:
+        Tuple[bool, bytes]: Whether the module has meaningful content, and its
+            minified body encoded as UTF-8
+    """
+    module_content = _strip_statements(content, import_spans, main_block_lines)
+
+    minified_content = module_content
+    if _needs_minification(module_content):
+        try:
+            minified_content = Minifier().minify(module_content)
+        except Exception as e:
+            print(f"Minification error: {e}")
+
+    return bool(module_content.strip()), minified_content.encode()
 
 
 class ChunkBuilder:
@@ -15,19 +207,37 @@ class ChunkBuilder:
     and manifest generation.
     """
 
-    def __init__(self, output_dir: str, project_root: str = None):
+    def __init__(
+        self,
+        output_dir: str,
+        project_root: str = None,
+        module_cache: Optional[ModuleCache] = None,
+    ):
         """
         Initialize a new ChunkBuilder instance.
 
         Args:
             output_dir (str): Directory where bundled chunks will be output
             project_root (str, optional): Root directory of the project for resolving internal imports
+            module_cache (ModuleCache, optional): Cache of parsed modules shared with the caller
         """
         self.output_dir = Path(output_dir)
         self.project_root = Path(project_root) if project_root else Path.cwd()
+        self.module_cache = module_cache or ModuleCache()
         self.minifier = Minifier()
         self.chunk_hashes = {}
+        self.chunk_sizes: Dict[str, int] = {}
         self.processed_files = set()
+        self._internal_cache: Dict[Tuple[str, Path], bool] = {}
+        self._minify_cache: Dict[bytes, str] = {}
+        self._render_cache: Dict[Tuple[bytes, bool], Tuple[bool, bytes]] = {}
+        self._output_dir_ready = False
+
+    def _ensure_output_dir(self):
+        """Create the output directory on first use."""
+        if not self._output_dir_ready:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            self._output_dir_ready = True
 
     def generate_chunk_hash(self, content: str) -> str:
         """
@@ -37,9 +247,15 @@ class ChunkBuilder:
             content (str): The chunk's source code content
 
         Returns:
-            str: 8-character MD5 hash of the content
+            str: 8-character BLAKE2b hash of the content
         """
-        return hashlib.md5(content.encode()).hexdigest()[:8]
+        hasher = self._new_chunk_hasher()
+        hasher.update(content.encode())
+        return hasher.hexdigest()
+
+    def _new_chunk_hasher(self):
+        """Return an empty hasher producing 8-character chunk hashes."""
+        return hashlib.blake2b(digest_size=4)
 
     def minify_code(self, content: str) -> str:
         """
@@ -51,27 +267,31 @@ class ChunkBuilder:
         Returns:
             str: Minified Python code, or original if minification fails
         """
+        if not _needs_minification(content):
+            return content
+
+        key = self._content_key(content)
+        cached = self._minify_cache.get(key)
+        if cached is not None:
+            return cached
+
         try:
-            return self.minifier.minify(content)
+            minified = self.minifier.minify(content)
         except Exception as e:
             print(f"Minification error: {e}")
             return content
 
-    def _is_stdlib_module(self, module_name: str) -> bool:
-        """Check if a module is from the Python standard library."""
-        import sys
-        import importlib.util
+        self._minify_cache[key] = minified
+        return minified
 
-        base_module = module_name.split(".")[0]
+    def _content_key(self, content: str) -> bytes:
+        """Return a digest of source content used to key the minification caches."""
+        return hashlib.blake2b(content.encode(), digest_size=16).digest()
 
-        if base_module in sys.builtin_module_names:
-            return True
-
-        spec = importlib.util.find_spec(base_module)
-        if spec is None:
-            return False
-
-        return "site-packages" not in str(spec.origin or "")
+    @staticmethod
+    def _is_stdlib_module(module_name: str) -> bool:
+        """Check if a module is from the Python standard library."""
+        return module_name.partition(".")[0] in STDLIB_MODULES
 
     def _is_internal_module(self, module_name: str, current_module: Path) -> bool:
         """
@@ -84,47 +304,28 @@ class ChunkBuilder:
         Returns:
             bool: True if the module is internal to the project
         """
-        parts = module_name.split(".")
-        module_dir = current_module.parent
-
-        # Check relative to current file first (most common for project imports)
-        if len(parts) == 1:
-            # Single module name like 'utils'
-            if (module_dir / parts[0] / "__init__.py").exists():
+        # The result only depends on the importing module's directory
+        key = (module_name, current_module.parent)
+        cached = self._internal_cache.get(key)
+        if cached is None:
+            cached = self._internal_cache[key] = self._probe_internal_module(
+                module_name, current_module.parent
+            )
+        return cached
+
+    def _probe_internal_module(self, module_name: str, module_dir: Path) -> bool:
+        """Probe the filesystem for an internal module relative to module_dir."""
+        relative_path = os.path.join(*module_name.split("."))
+
+        # Check relative to the current file first (most common for project
+        # imports), then its parent directory for sibling packages, then the
+        # project root
+        for base_dir in (str(module_dir), str(module_dir.parent), str(self.project_root)):
+            module_path = os.path.join(base_dir, relative_path)
+            if self.module_cache.is_file(module_path + ".py"):
                 return True
-            if (module_dir / f"{parts[0]}.py").exists():
-                return True
-            # Check parent directory for sibling packages
-            if (module_dir.parent / parts[0] / "__init__.py").exists():
-                return True
-            if (module_dir.parent / f"{parts[0]}.py").exists():
-                return True
-        else:
-            # Multi-part like 'utils.math_helpers'
-            relative_module = module_dir / Path(*parts[:-1]) / f"{parts[-1]}.py"
-            if relative_module.exists():
+            if self.module_cache.is_file(os.path.join(module_path, "__init__.py")):
                 return True
-            relative_package = module_dir / Path(*parts) / "__init__.py"
-            if relative_package.exists():
-                return True
-            # Check parent directory for sibling packages
-            parent_module = module_dir.parent / Path(*parts[:-1]) / f"{parts[-1]}.py"
-            if parent_module.exists():
-                return True
-            parent_package = module_dir.parent / Path(*parts) / "__init__.py"
-            if parent_package.exists():
-                return True
-
-        # Check from project root
-        module_path = self.project_root / Path(module_name.replace(".", "/") + ".py")
-        if module_path.exists():
-            return True
-
-        package_init = (
-            self.project_root / Path(module_name.replace(".", "/")) / "__init__.py"
-        )
-        if package_init.exists():
-            return True
 
         return False
 
@@ -139,26 +340,15 @@ class ChunkBuilder:
         Returns:
             Optional[Path]: Resolved path to the module file, or None if not found
         """
-        module_path = self.project_root / Path(module_name.replace(".", "/") + ".py")
-        if module_path.exists():
-            return module_path
+        relative_path = os.path.join(*module_name.split("."))
 
-        package_init = (
-            self.project_root / Path(module_name.replace(".", "/")) / "__init__.py"
-        )
-        if package_init.exists():
-            return package_init
-
-        module_dir = current_module.parent
-        relative_module_path = module_dir / Path(module_name.replace(".", "/") + ".py")
-        if relative_module_path.exists():
-            return relative_module_path
-
-        relative_package_init = (
-            module_dir / Path(module_name.replace(".", "/")) / "__init__.py"
-        )
-        if relative_package_init.exists():
-            return relative_package_init
+        for base_dir in (str(self.project_root), str(current_module.parent)):
+            module_path = os.path.join(base_dir, relative_path)
+            if self.module_cache.is_file(module_path + ".py"):
+                return Path(module_path + ".py")
+            package_init = os.path.join(module_path, "__init__.py")
+            if self.module_cache.is_file(package_init):
+                return Path(package_init)
 
         return None
 
@@ -187,20 +377,7 @@ class ChunkBuilder:
         """
         Return the code for the chunk loader.
         """
-        return """
-def __load_chunk__(name):
-    import importlib.util
-    import sys
-    import os
-    if name in sys.modules:
-        return sys.modules[name]
-    chunk_path = os.path.join(os.path.dirname(__file__), f"{name}.py")
-    spec = importlib.util.spec_from_file_location(name, chunk_path)
-    module = importlib.util.module_from_spec(spec)
-    sys.modules[name] = module
-    spec.loader.exec_module(module)
-    return module
-    """
+        return _LOADER_CODE
 
     def build_chunk(
         self,
@@ -208,6 +385,7 @@ def __load_chunk__(name):
         modules: Set[Path],
         sorted_modules: List[Path],
         module_to_chunk: Dict[Path, str],
+        module_order: Optional[Dict[Path, int]] = None,
     ) -> Tuple[Optional[Path], Optional[str]]:
         """
         Build a chunk file containing multiple module contents.
@@ -217,18 +395,27 @@ def __load_chunk__(name):
             modules (Set[Path]): Set of module paths to include in the chunk
             sorted_modules (List[Path]): Topologically sorted modules
             module_to_chunk (Dict[Path, str]): Mapping of modules to their chunks
+            module_order (Optional[Dict[Path, int]]): Position of each module in
+                sorted_modules; built from sorted_modules when not given
 
         Returns:
             Tuple[Optional[Path], Optional[str]]: Tuple of (chunk output path, hashed filename)
             Returns (None, None) if the chunk would be empty or contains no meaningful content
         """
-        modules_in_sorted = [m for m in modules if m in sorted_modules]
+        if module_order is None:
+            module_order = {module: i for i, module in enumerate(sorted_modules)}
+
+        # Chunk modules in dependency order; used by every pass below. Sorting
+        # by index costs O(k log k) per chunk instead of a scan of every module
+        modules_in_sorted = sorted(
+            (m for m in modules if m in module_order), key=module_order.__getitem__
+        )
         if not modules_in_sorted:
             print(f"Skipping empty chunk: {chunk_name}")
             return None, None
 
         if chunk_name != "main":
-            modules_in_other_chunks = []
+            modules_in_other_chunks: List[Path] = []
             for module in modules_in_sorted:
                 assigned_chunk = module_to_chunk.get(module)
                 if (
@@ -242,149 +429,196 @@ def __load_chunk__(name):
                 if module in modules:
                     modules.remove(module)
 
-            modules_in_sorted = [m for m in modules if m in sorted_modules]
+            modules_in_sorted = [m for m in modules_in_sorted if m in modules]
             if not modules_in_sorted:
                 print(
                     f"Skipping redundant chunk: {chunk_name} (all modules already in other chunks)"
                 )
                 return None, None
 
-        chunk_code = []
-        import_tracker = {
-            "standard": set(),
-            "relative": set(),
-            "third_party": set(),
-            "chunk_imports": set(),
+        header_code = io.StringIO()
+        # Each bucket is kept sorted and de-duplicated as lines are added
+        import_tracker: Dict[str, List[str]] = {
+            "standard": [],
+            "relative": [],
+            "third_party": [],
+            "chunk_imports": [],
         }
 
-        chunk_code.append(f"# Chunk: {chunk_name}")
+        header_code.write(f"# Chunk: {chunk_name}")
+
+        def emit(piece: str) -> None:
+            header_code.write("\n\n")
+            header_code.write(piece)
 
         if chunk_name == "main":
-            chunk_code.append(self._get_loader_code())
+            emit(self._get_loader_code())
 
             for mod in self.processed_files:
                 if mod in module_to_chunk and module_to_chunk[mod] != "main":
                     chunk_module = module_to_chunk[mod]
-                    print("test", module_to_chunk)
-                    import_tracker["chunk_imports"].add(f"{chunk_module}")
-
-        for module in modules:
-            if module in sorted_modules:
-                with open(module, "r") as f:
-                    content = f.read()
-                    tree = ast.parse(content)
-
-                    for node in ast.walk(tree):
-                        if isinstance(node, ast.Import):
-                            for name in node.names:
-                                import_line = f"import {name.name}"
-                                if name.asname:
-                                    import_line += f" as {name.asname}"
-                                if self._is_stdlib_module(name.name):
-                                    import_tracker["standard"].add(import_line)
-                                elif self._is_internal_module(name.name, module):
-                                    # Skip internal imports - they will be bundled in this chunk
-                                    continue
-                                else:
-                                    import_tracker["third_party"].add(import_line)
-
-                        elif isinstance(node, ast.ImportFrom):
-                            if node.level > 0:
-                                module_path = self._resolve_relative_import(
-                                    module, node
-                                )
-                                if module_path and module_path in modules:
-                                    continue
-                                import_line = self._format_relative_import(node)
-                                import_tracker["relative"].add(import_line)
-                            else:
-                                if self._is_stdlib_module(node.module):
-                                    import_line = f"from {node.module} import {', '.join([n.name for n in node.names])}"
-                                    import_tracker["standard"].add(import_line)
-                                elif self._is_internal_module(node.module, module):
-                                    # Skip internal imports - they will be bundled in this chunk
-                                    continue
-                                else:
-                                    import_line = f"from {node.module} import {', '.join([n.name for n in node.names])}"
-                                    import_tracker["third_party"].add(import_line)
-
-        chunk_code.extend(sorted(import_tracker["standard"]))
-        chunk_code.extend(sorted(import_tracker["third_party"]))
-        chunk_code.extend(sorted(import_tracker["relative"]))
+                    _insort_unique(import_tracker["chunk_imports"], f"{chunk_module}")
+
+        module_sources: Dict[Path, str] = {}
+        module_trees: Dict[Path, ast.Module] = {}
+        for module, (source, tree) in self.module_cache.load_many(modules_in_sorted).items():
+            module_sources[module] = source
+            module_trees[module] = tree
+
+        # Hoisted out of the per-node loop below
+        standard_imports = import_tracker["standard"]
+        third_party_imports = import_tracker["third_party"]
+        relative_imports = import_tracker["relative"]
+        is_stdlib = self._is_stdlib_module
+        is_internal = self._is_internal_module
+        Import = ast.Import
+
+        # Import positions are collected in the same pass, for stripping later
+        import_spans: Dict[Path, List[Tuple[int, int, int, int]]] = {}
+
+        for module in modules_in_sorted:
+            spans = import_spans[module] = []
+            for node in iter_import_nodes(module_trees[module]):
+                spans.append(
+                    (node.lineno, node.col_offset, node.end_lineno, node.end_col_offset)
+                )
+                # iter_import_nodes only yields Import and ImportFrom nodes
+                if type(node) is Import:
+                    for name in node.names:
+                        import_line: str = f"import {name.name}"
+                        if name.asname:
+                            import_line += f" as {name.asname}"
+                        if is_stdlib(name.name):
+                            _insort_unique(standard_imports, import_line)
+                        elif is_internal(name.name, module):
+                            # Skip internal imports - they will be bundled in this chunk
+                            continue
+                        else:
+                            _insort_unique(third_party_imports, import_line)
+
+                else:
+                    if node.level > 0:
+                        module_path = self._resolve_relative_import(
+                            module, node
+                        )
+                        if module_path and module_path in modules:
+                            continue
+                        import_line = self._format_relative_import(node)
+                        _insort_unique(relative_imports, import_line)
+                    else:
+                        if is_stdlib(node.module):
+                            import_line = f"from {node.module} import {', '.join([n.name for n in node.names])}"
+                            _insort_unique(standard_imports, import_line)
+                        elif is_internal(node.module, module):
+                            # Skip internal imports - they will be bundled in this chunk
+                            continue
+                        else:
+                            import_line = f"from {node.module} import {', '.join([n.name for n in node.names])}"
+                            _insort_unique(third_party_imports, import_line)
+
+        for import_line in import_tracker["standard"]:
+            emit(import_line)
+        for import_line in import_tracker["third_party"]:
+            emit(import_line)
+        for import_line in import_tracker["relative"]:
+            emit(import_line)
 
         if chunk_name == "main" and import_tracker["chunk_imports"]:
-            for chunk_import in sorted(import_tracker["chunk_imports"]):
+            for chunk_import in import_tracker["chunk_imports"]:
                 chunk_hash = self.chunk_hashes.get(chunk_import)
                 if chunk_hash:
-                    chunk_code.append(f"__load_chunk__('{chunk_import}.{chunk_hash}')")
+                    emit(f"__load_chunk__('{chunk_import}.{chunk_hash}')")
                 else:
-                    chunk_code.append(f"__load_chunk__('{chunk_import}')")
-
-        has_meaningful_content = False
-        for module in sorted_modules:  # Use sorted order instead of iterating through modules set
-            if module in modules:  # Only process if it's in this chunk
-                with open(module, "r") as f:
-                    content = f.read()
-                    lines = content.split("\n")
-                    filtered_lines = []
-                    in_main_block = False
-
-                    for line in lines:
-                        stripped = line.strip()
-
-                        if stripped and not stripped.startswith(("import ", "from ")):
-                            if stripped == "if __name__ == '__main__':":
-                                in_main_block = True
-                                if chunk_name == "main":
-                                    filtered_lines.append(line)
-                            elif in_main_block:
-                                if chunk_name == "main":
-                                    filtered_lines.append(line)
-                            else:
-                                filtered_lines.append(line)
-
-                        if in_main_block and not stripped:
-                            if not any(
-                                next_line.startswith(" ")
-                                for next_line in lines[lines.index(line) + 1 :]
-                                if next_line.strip()
-                            ):
-                                in_main_block = False
-
-                    module_content = "\n".join(filtered_lines)
-
-                    if module_content.strip():
-                        has_meaningful_content = True
-
-                    chunk_code.append(f"\n# Module: {module.name}")
-
-                    try:
-                        minified_content = self.minify_code(module_content)
-                        chunk_code.append(minified_content)
-                    except Exception as e:
-                        print(f"Error processing module {module}: {e}")
-                        chunk_code.append(module_content)
-
-        if not has_meaningful_content:
+                    emit(f"__load_chunk__('{chunk_import}')")
+
+        keep_main_block: bool = chunk_name == "main"
+        keys: List[Tuple[bytes, bool]] = [
+            (self._content_key(module_sources[m]), keep_main_block)
+            for m in modules_in_sorted
+        ]
+
+        # Only modules whose source has not been rendered before are dispatched
+        pending: Dict[Tuple[bytes, bool], Path] = {}
+        for key, module in zip(keys, modules_in_sorted):
+            if key not in self._render_cache and key not in pending:
+                pending[key] = module
+        pending_sources = [module_sources[m] for m in pending.values()]
+        pending_imports = [import_spans[m] for m in pending.values()]
+        pending_main_blocks = [
+            () if keep_main_block else _main_block_lines(module_trees[m])
+            for m in pending.values()
+        ]
+
+        rendered = None
+        # Worker processes are only started when forked: under spawn/forkserver
+        # they re-import __main__, which breaks scripts without a main guard
+        if (
+            len(pending) >= PARALLEL_MIN_MODULES
+            and multiprocessing.get_start_method() == "fork"
+        ):
+            try:
+                with ProcessPoolExecutor() as pool:
+                    rendered = list(
+                        pool.map(
+                            _render_module,
+                            pending_sources,
+                            pending_imports,
+                            pending_main_blocks,
+                        )
+                    )
+            except (BrokenProcessPool, RuntimeError):
+                rendered = None
+        if rendered is None:
+            rendered = map(
+                _render_module, pending_sources, pending_imports, pending_main_blocks
+            )
+        self._render_cache.update(zip(pending, rendered))
+
+        bodies = [self._render_cache[key] for key in keys]
+        if not any(has_content for has_content, _ in bodies):
             print(f"Skipping chunk {chunk_name} with no meaningful content")
             return None, None
 
-        chunk_content = "\n\n".join(chunk_code)
-        chunk_hash = self.generate_chunk_hash(chunk_content)
+        # Module bodies are already minified one by one, so only the loader and
+        # import header still needs a minifier pass of its own
+        pieces = [self.minify_code(header_code.getvalue()).encode()]
+        pieces.extend(module_body for _, module_body in bodies)
+
+        # The chunk is streamed to a temporary file and hashed as it is written,
+        # then renamed once its hash is known
+        self._ensure_output_dir()
+        hasher = self._new_chunk_hasher()
+        temp_path = self.output_dir / f".{chunk_name}.py.tmp"
+        # The temporary file is removed if writing, hashing or renaming fails,
+        # so an interrupted build leaves no partial chunk behind
+        try:
+            with open(temp_path, "wb", buffering=CHUNK_WRITE_BUFFER_SIZE) as f:
+                for piece in pieces:
+                    if not piece:
+                        continue
+                    if f.tell():
+                        f.write(b"\n")
+                        hasher.update(b"\n")
+                    f.write(piece)
+                    hasher.update(piece)
+                chunk_size = f.tell()
+
+            chunk_hash = hasher.hexdigest()
+            hashed_filename = f"{chunk_name}.{chunk_hash}.py"
+            output_path = self.output_dir / hashed_filename
+            temp_path.replace(output_path)
+        except BaseException:
+            temp_path.unlink(missing_ok=True)
+            raise
+
         self.chunk_hashes[chunk_name] = chunk_hash
-        hashed_filename = f"{chunk_name}.{chunk_hash}.py"
-        output_path = self.output_dir / hashed_filename
+        self.chunk_sizes[chunk_name] = chunk_size
 
         if chunk_name != "main":
             for module in modules:
                 if module in self.processed_files and module in module_to_chunk:
                     self.processed_files.add((module, chunk_hash))
 
-        os.makedirs(self.output_dir, exist_ok=True)
-
-        with open(output_path, "w", newline="\n") as f:
-            f.write(self.minifier.minify(chunk_content))
-
         return output_path, hashed_filename
 
     def generate_chunk_manifest(
@@ -392,6 +626,7 @@ def __load_chunk__(name):
         chunks: Dict[str, Set[Path]],
         module_to_chunk: Dict[Path, str],
         chunk_dependencies: Dict[str, Set[str]],
+        indent: Optional[int] = None,
     ):
         """
         Generate a manifest.json file containing chunk metadata.
@@ -400,19 +635,27 @@ def __load_chunk__(name):
             chunks (Dict[str, Set[Path]]): Dictionary mapping chunk names to their modules
             module_to_chunk (Dict[Path, str]): Dictionary mapping modules to their chunk name
             chunk_dependencies (Dict[str, Set[str]]): Dictionary mapping chunk names to their dependent chunks
+            indent (int, optional): Pretty-print with this indent instead of writing compact JSON
         """
+        # Paths appear both in chunk module lists and in moduleToChunk
+        module_names = {module: str(module) for module in module_to_chunk}
+        for modules in chunks.values():
+            for module in modules:
+                if module not in module_names:
+                    module_names[module] = str(module)
+
         manifest = {
             "version": int(time.time()),
             "chunks": {
                 chunk_name: {
-                    "modules": [str(m) for m in modules],
+                    "modules": [module_names[m] for m in modules],
                     "file": f"{chunk_name}.{self.chunk_hashes[chunk_name]}.py",
                     "imports": list(chunk_dependencies.get(chunk_name, [])),
                 }
                 for chunk_name, modules in chunks.items()
             },
             "moduleToChunk": {
-                str(module): chunk_name
+                module_names[module]: chunk_name
                 for module, chunk_name in module_to_chunk.items()
             },
             "fileMap": {
@@ -421,5 +664,14 @@ def __load_chunk__(name):
             },
         }
 
-        with open(self.output_dir / "manifest.json", "w") as f:
-            json.dump(manifest, f, indent=2)
+        self._ensure_output_dir()
+
+        # orjson only supports two-space indentation, other indents use json
+        if orjson is not None and indent in (None, 2):
+            option = orjson.OPT_INDENT_2 if indent else 0
+            manifest_bytes = orjson.dumps(manifest, option=option)
+        elif indent is None:
+            manifest_bytes = json.dumps(manifest, separators=(",", ":")).encode()
+        else:
+            manifest_bytes = json.dumps(manifest, indent=indent).encode()
+        (self.output_dir / "manifest.json").write_bytes(manifest_bytes)
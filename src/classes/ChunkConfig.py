@@ -1,7 +1,106 @@
-from typing import List, Optional, Union
+import re
+from typing import Callable, List, Optional, Tuple, Union
 from pathlib import Path
 
 
+# Include patterns of the form `.*/name/.*\.py`, as generated by
+# Packer.auto_generate_chunks, or `.*[/\\]name[/\\].*\.py` as in the README example
+_DIRECTORY_PATTERN = re.compile(r"\.\*(/|\[/\\\\\])([\w-]+)\1\.\*\\\.py")
+
+# Flags of a pattern compiled without inline flags
+_DEFAULT_FLAGS = re.compile("").flags
+
+
+def _directory_matcher(pattern: re.Pattern) -> Optional[Callable[[str], bool]]:
+    """
+    Build a substring-based matcher for a directory include pattern.
+
+    Such a pattern matches when the path contains `/name/` with `.py` somewhere
+    after it. Paths containing newlines, which `.` does not match, still go
+    through the regex.
+
+    Args:
+        pattern (re.Pattern): Compiled include pattern
+
+    Returns:
+        Optional[Callable[[str], bool]]: Function returning True if a path matches,
+            or None if the pattern is not a directory pattern
+    """
+    directory_pattern = _DIRECTORY_PATTERN.fullmatch(pattern.pattern)
+    if directory_pattern is None:
+        return None
+
+    separator, directory = directory_pattern.groups()
+    needle = f"/{directory}/"
+    any_separator = separator != "/"
+
+    def match(path: str) -> bool:
+        if "\n" in path:
+            return pattern.match(path) is not None
+        if any_separator:
+            path = path.replace("\\", "/")
+        index = path.find(needle)
+        return index >= 0 and ".py" in path[index + len(needle):]
+
+    return match
+
+
+def _union_pattern(patterns: List[re.Pattern]) -> Optional[re.Pattern]:
+    """
+    Combine patterns into one alternation that matches wherever any of them does.
+
+    Patterns with capture groups (whose numbering would shift) or inline global
+    flags (which would apply to every alternative) are not combined.
+
+    Args:
+        patterns (List[re.Pattern]): Compiled include patterns
+
+    Returns:
+        Optional[re.Pattern]: The combined pattern, or None if they cannot be combined
+    """
+    if any(p.groups or p.flags != _DEFAULT_FLAGS for p in patterns):
+        return None
+    try:
+        return re.compile("|".join(f"(?:{p.pattern})" for p in patterns))
+    except re.error:
+        return None
+
+
+def _include_matcher(patterns: List[re.Pattern]) -> Callable[[str], bool]:
+    """
+    Build a function that tells whether a file path matches any include pattern.
+
+    Directory patterns are checked with substring searches, and the remaining
+    patterns are combined into a single regex when possible so each path is
+    scanned once.
+
+    Args:
+        patterns (List[re.Pattern]): Compiled include patterns
+
+    Returns:
+        Callable[[str], bool]: Function returning True if a path matches any pattern
+    """
+    matchers = []
+    regexes = []
+    for pattern in patterns:
+        directory_matcher = _directory_matcher(pattern)
+        if directory_matcher is not None:
+            matchers.append(directory_matcher)
+        else:
+            regexes.append(pattern)
+
+    if len(regexes) > 1:
+        union = _union_pattern(regexes)
+        if union is not None:
+            regexes = [union]
+    for regex in regexes:
+        matchers.append(lambda path, regex=regex: regex.match(path) is not None)
+
+    if len(matchers) == 1:
+        return matchers[0]
+    return lambda path: any(matcher(path) for matcher in matchers)
+
+
 class ChunkConfig:
     def __init__(
         self, name: str, entry_points: List[Union[str, Path]], includes: Optional[List[str]] = None
@@ -9,3 +108,22 @@ class ChunkConfig:
         self.name = name
         self.entry_points = [Path(ep) if isinstance(ep, str) else ep for ep in entry_points]
         self.includes = includes or []
+        self._include_snapshot: Optional[Tuple[str, ...]] = None
+        self._include_matcher: Optional[Callable[[str], bool]] = None
+
+    @property
+    def include_matcher(self) -> Callable[[str], bool]:
+        """
+        Function telling whether a file path matches any include pattern.
+
+        Built from the includes on first use, and rebuilt whenever they have
+        changed since, so an invalid pattern raises when modules are assigned
+        to chunks.
+        """
+        snapshot = tuple(self.includes)
+        if self._include_matcher is None or snapshot != self._include_snapshot:
+            self._include_matcher = _include_matcher(
+                [re.compile(pattern) for pattern in snapshot]
+            )
+            self._include_snapshot = snapshot
+        return self._include_matcher
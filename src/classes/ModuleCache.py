@@ -0,0 +1,171 @@
+import os
+import ast
+from pathlib import Path
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, FrozenSet, Tuple, Iterable, Iterator, Union
+
+
+# Child blocks that may contain import statements, per AST node type
+_IMPORT_BLOCK_FIELDS = {
+    ast.FunctionDef: ("body",),
+    ast.AsyncFunctionDef: ("body",),
+    ast.ClassDef: ("body",),
+    ast.If: ("body", "orelse"),
+    ast.For: ("body", "orelse"),
+    ast.AsyncFor: ("body", "orelse"),
+    ast.While: ("body", "orelse"),
+    ast.With: ("body",),
+    ast.AsyncWith: ("body",),
+    ast.Try: ("body", "handlers", "orelse", "finalbody"),
+    ast.TryStar: ("body", "handlers", "orelse", "finalbody"),
+    ast.ExceptHandler: ("body",),
+    ast.Match: ("cases",),
+    ast.match_case: ("body",),
+}
+
+
+def iter_import_nodes(tree: ast.Module) -> Iterator[Union[ast.Import, ast.ImportFrom]]:
+    """
+    Yield the import statements of a module without walking expressions.
+
+    Only statement blocks listed in _IMPORT_BLOCK_FIELDS are scanned (module,
+    function and class bodies, and the branches of compound statements),
+    since imports can only appear there. Imports nested in functions are
+    still yielded, so the result matches a full ast.walk over the module.
+
+    Args:
+        tree (ast.Module): Parsed module
+
+    Yields:
+        Union[ast.Import, ast.ImportFrom]: Import nodes found in the module
+    """
+    pending = deque((tree.body,))
+    while pending:
+        for node in pending.popleft():
+            node_type = type(node)
+            if node_type is ast.Import or node_type is ast.ImportFrom:
+                yield node
+                continue
+            for field in _IMPORT_BLOCK_FIELDS.get(node_type, ()):
+                block = getattr(node, field)
+                if block:
+                    pending.append(block)
+
+
+def _read_module(module: Path) -> Tuple[str, ast.Module]:
+    """
+    Read a module and parse its AST straight from the raw bytes.
+
+    Args:
+        module (Path): Path of the module to read
+
+    Returns:
+        Tuple[str, ast.Module]: The decoded source code and its parsed AST
+    """
+    data = module.read_bytes()
+    return data.decode("utf-8"), ast.parse(data, filename=str(module))
+
+
+class ModuleCache:
+    """
+    Caches the source code and parsed AST of module files so that dependency
+    analysis and chunk building read and parse each file only once.
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty ModuleCache.
+
+        Entries are keyed by path and revalidated against the file's
+        modification time, so edited files are picked up again.
+        """
+        self._entries: Dict[Path, Tuple[int, str, ast.Module]] = {}
+        self._directory_files: Dict[str, FrozenSet[str]] = {}
+
+    def is_file(self, path: Union[str, Path]) -> bool:
+        """
+        Check whether a file exists, using a cached listing of its directory.
+
+        Each directory is scanned once, so probing many candidate module paths
+        in the same directories costs a set lookup instead of a stat call.
+        Listings are kept until clear_directory_listings is called, which
+        Packer.pack does at the start of every run.
+
+        Args:
+            path (Union[str, Path]): Path of the file to check
+
+        Returns:
+            bool: True if the path names an existing regular file
+        """
+        directory, name = os.path.split(os.fspath(path))
+        files = self._directory_files.get(directory)
+        if files is None:
+            try:
+                with os.scandir(directory or ".") as entries:
+                    files = frozenset(entry.name for entry in entries if entry.is_file())
+            except OSError:
+                files = frozenset()
+            self._directory_files[directory] = files
+        return name in files
+
+    def clear_directory_listings(self) -> None:
+        """
+        Forget the cached directory listings used by is_file, so files added
+        or removed since they were scanned are seen by the next probe.
+        """
+        self._directory_files.clear()
+
+    def load(self, module: Path) -> Tuple[str, ast.Module]:
+        """
+        Read and parse a single module, reusing the cached result if unchanged.
+
+        Args:
+            module (Path): Path of the module to load
+
+        Returns:
+            Tuple[str, ast.Module]: The module's source code and its parsed AST
+
+        Raises:
+            FileNotFoundError: If the module does not exist
+        """
+        return self.load_many([module])[module]
+
+    def load_many(self, modules: Iterable[Path]) -> Dict[Path, Tuple[str, ast.Module]]:
+        """
+        Read and parse modules, reusing cached results while files are unchanged.
+
+        Modules that are new or modified since they were cached are read and
+        parsed on a thread pool, since both steps are independent per file.
+
+        Args:
+            modules (Iterable[Path]): Paths of the modules to load
+
+        Returns:
+            Dict[Path, Tuple[str, ast.Module]]: Source code and parsed AST per module
+
+        Raises:
+            FileNotFoundError: If any of the modules does not exist
+        """
+        loaded = {}
+        stale = []
+        for module in modules:
+            mtime = module.stat().st_mtime_ns
+            cached = self._entries.get(module)
+            if cached is not None and cached[0] == mtime:
+                loaded[module] = (cached[1], cached[2])
+            else:
+                stale.append((module, mtime))
+
+        stale_paths = [module for module, _ in stale]
+        if len(stale_paths) > 1:
+            with ThreadPoolExecutor() as pool:
+                results = list(pool.map(_read_module, stale_paths))
+        else:
+            results = map(_read_module, stale_paths)
+
+        for (module, mtime), (source, tree) in zip(stale, results):
+            self._entries[module] = (mtime, source, tree)
+            loaded[module] = (source, tree)
+
+        return loaded
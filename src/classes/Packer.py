@@ -1,14 +1,15 @@
 import os
 import ast
 from pathlib import Path
-import re
 from typing import Dict, Set, List, Tuple
 import time
-from collections import defaultdict
+from collections import Counter, defaultdict
+from graphlib import TopologicalSorter, CycleError
 from termcolor import colored
 
 from .ChunkConfig import ChunkConfig
-from .ChunkBuilder import ChunkBuilder
+from .ChunkBuilder import ChunkBuilder, STDLIB_MODULES
+from .ModuleCache import ModuleCache, iter_import_nodes
 
 
 class Packer:
@@ -32,10 +33,13 @@ class Packer:
         self.output_dir = Path(output_dir)
         self.processed_files = set()
         self.dependencies = {}
+        self.dependents: Dict[Path, Set[Path]] = defaultdict(set)
         self.chunks: Dict[str, Set[Path]] = {}
         self.module_to_chunk: Dict[Path, str] = {}
         self.sorted_modules = []
-        self.chunk_builder = ChunkBuilder(output_dir)
+        self.module_order: Dict[Path, int] = {}
+        self.module_cache = ModuleCache()
+        self.chunk_builder = ChunkBuilder(output_dir, module_cache=self.module_cache)
 
     def configure_chunks(self, chunks: List[ChunkConfig]):
         """
@@ -57,8 +61,7 @@ class Packer:
         Returns:
             List[str]: List of dynamically imported module names
         """
-        with open(file_path, "r") as f:
-            tree = ast.parse(f.read())
+        _, tree = self.module_cache.load(file_path)
 
         dynamic_imports = []
         for node in ast.walk(tree):
@@ -88,6 +91,8 @@ class Packer:
         self.chunks["main"] = {self.entry_point}
         self.module_to_chunk[self.entry_point] = "main"
 
+        file_strs = {file: str(file) for file in self.processed_files}
+
         for chunk_config in self.chunk_configs:
             self.chunks[chunk_config.name] = set()
 
@@ -95,22 +100,23 @@ class Packer:
                 self.chunks[chunk_config.name].add(entry)
                 self.module_to_chunk[entry] = chunk_config.name
 
-            for include_pattern in chunk_config.includes:
-                for file in self.processed_files:
-                    if re.match(include_pattern, str(file)):
+            if chunk_config.includes:
+                include_matcher = chunk_config.include_matcher
+                for file, file_str in file_strs.items():
+                    if include_matcher(file_str):
                         self.chunks[chunk_config.name].add(file)
                         self.module_to_chunk[file] = chunk_config.name
 
         for module in self.processed_files:
             if module not in self.module_to_chunk:
-                chunk_counts = {}
-                for dep in self.dependencies.get(module, []):
-                    if dep in self.module_to_chunk:
-                        chunk = self.module_to_chunk[dep]
-                        chunk_counts[chunk] = chunk_counts.get(chunk, 0) + 1
+                chunk_counts = Counter(
+                    self.module_to_chunk[dep]
+                    for dep in self.dependencies.get(module, ())
+                    if dep in self.module_to_chunk
+                )
 
                 if chunk_counts:
-                    best_chunk = max(chunk_counts.items(), key=lambda x: x[1])[0]
+                    best_chunk = chunk_counts.most_common(1)[0][0]
                     self.chunks[best_chunk].add(module)
                     self.module_to_chunk[module] = best_chunk
                 else:
@@ -136,9 +142,34 @@ class Packer:
                         imports.add(dep_chunk)
         return imports
 
+    def get_all_chunk_imports(self) -> Dict[str, Set[str]]:
+        """
+        Get the chunks that every chunk depends on, in a single pass over all
+        dependency edges.
+
+        Returns:
+            Dict[str, Set[str]]: Mapping of chunk names to the chunk names they import from
+        """
+        imports: Dict[str, Set[str]] = {chunk_name: set() for chunk_name in self.chunks}
+        module_to_chunk = self.module_to_chunk
+        for module, deps in self.dependencies.items():
+            chunk_name = module_to_chunk.get(module)
+            if chunk_name is None:
+                continue
+            chunk_imports = imports.setdefault(chunk_name, set())
+            for dep in deps:
+                dep_chunk = module_to_chunk.get(dep)
+                if dep_chunk is not None and dep_chunk != chunk_name:
+                    chunk_imports.add(dep_chunk)
+        return imports
+
     def process_file(self, file_path: Path) -> None:
         """
-        Process a Python file and recursively analyze its dependencies.
+        Process a Python file and all the modules it transitively depends on.
+
+        The dependency graph is walked breadth-first, and each level of newly
+        discovered modules is loaded as one batch so their reads and parses
+        overlap.
 
         Args:
             file_path (Path): Path to the Python file to process
@@ -147,104 +178,140 @@ class Packer:
             return
 
         self.processed_files.add(file_path)
+        batch = [file_path]
+
+        while batch:
+            try:
+                loaded = self.module_cache.load_many(batch)
+            except FileNotFoundError:
+                # Fall back to loading one by one to report each missing file
+                loaded = {}
+                for module in batch:
+                    try:
+                        loaded[module] = self.module_cache.load(module)
+                    except FileNotFoundError:
+                        print(f"Warning: File not found: {module}")
+
+            next_batch = []
+            for module in batch:
+                if module not in loaded:
+                    continue
+                module_paths = self._resolve_dependencies(module, loaded[module][1])
+                self.dependencies[module] = module_paths
+                for dep_path in module_paths:
+                    self.dependents[dep_path].add(module)
+                    if dep_path not in self.processed_files:
+                        self.processed_files.add(dep_path)
+                        next_batch.append(dep_path)
+            batch = next_batch
+
+    def _resolve_dependencies(self, file_path: Path, tree: ast.Module) -> Set[Path]:
+        """
+        Resolve the imports of a module to the project files they refer to.
 
-        try:
-            with open(file_path, "r") as f:
-                tree = ast.parse(f.read())
-        except FileNotFoundError:
-            print(f"Warning: File not found: {file_path}")
-            return
+        Args:
+            file_path (Path): Path of the module
+            tree (ast.Module): Parsed AST of the module
 
+        Returns:
+            Set[Path]: Paths of the project modules imported by the module
+        """
         dependencies = set()
-        for node in ast.walk(tree):
+        for node in iter_import_nodes(tree):
             if isinstance(node, ast.Import):
                 for name in node.names:
                     dependencies.add(name.name)
-            elif isinstance(node, ast.ImportFrom):
-                if node.module:
-                    dependencies.add(node.module)
-
-        file_dir = file_path.parent
+            elif node.module:
+                dependencies.add(node.module)
+
+        # Candidates are built as strings with os.path, and only a hit is turned
+        # into a Path. Parent and project root are computed once per module
+        file_dir = str(file_path.parent)
+        parent_dir = str(file_path.parent.parent)
+        project_root = os.getcwd()
+        is_file = self.module_cache.is_file
+        join = os.path.join
         module_paths = set()
 
         for dep in dependencies:
             parts = dep.split(".")
-            project_root = Path.cwd()
-
             # Construct paths properly for multipart module names
             if len(parts) == 1:
                 # Single module name like 'os' or 'utils'
                 possible_paths = [
                     # Try relative to current file first
-                    file_dir / parts[0] / "__init__.py",
-                    file_dir / f"{parts[0]}.py",
+                    join(file_dir, parts[0], "__init__.py"),
+                    join(file_dir, f"{parts[0]}.py"),
                     # Try from parent directory (for sibling packages)
-                    file_dir.parent / parts[0] / "__init__.py",
-                    file_dir.parent / f"{parts[0]}.py",
+                    join(parent_dir, parts[0], "__init__.py"),
+                    join(parent_dir, f"{parts[0]}.py"),
                     # Try from project root
-                    project_root / parts[0] / "__init__.py",
-                    project_root / f"{parts[0]}.py",
+                    join(project_root, parts[0], "__init__.py"),
+                    join(project_root, f"{parts[0]}.py"),
                 ]
             else:
                 # Multipart like 'utils.math_helpers' or 'models.user'
-                # Try relative to current file first
-                relative_module = file_dir / Path(*parts[:-1]) / f"{parts[-1]}.py"
-                relative_package = file_dir / Path(*parts) / "__init__.py"
-                # Try from parent directory (for sibling packages like utils.math_helpers when in services/)
-                parent_module = file_dir.parent / Path(*parts[:-1]) / f"{parts[-1]}.py"
-                parent_package = file_dir.parent / Path(*parts) / "__init__.py"
-                # Try from project root
-                module_file = project_root / Path(*parts[:-1]) / f"{parts[-1]}.py"
-                package_init = project_root / Path(*parts) / "__init__.py"
+                module_rel = join(*parts[:-1], f"{parts[-1]}.py")
+                package_rel = join(*parts, "__init__.py")
 
                 possible_paths = [
-                    relative_module,
-                    relative_package,
-                    parent_module,  # This will find example/utils/math_helpers.py from example/services/
-                    parent_package,
-                    module_file,
-                    package_init,
+                    # Try relative to current file first
+                    join(file_dir, module_rel),
+                    join(file_dir, package_rel),
+                    # Try from parent directory (for sibling packages like
+                    # utils.math_helpers when in services/)
+                    join(parent_dir, module_rel),
+                    join(parent_dir, package_rel),
+                    # Try from project root
+                    join(project_root, module_rel),
+                    join(project_root, package_rel),
                 ]
 
+            # Standard library names are only looked up next to the importing
+            # module, where a project file shadowing them is still bundled
+            is_stdlib = parts[0] in STDLIB_MODULES
+            if is_stdlib:
+                possible_paths = possible_paths[:2]
+
             for path in possible_paths:
-                if path.exists():
-                    module_paths.add(path)
+                if is_file(path):
+                    if is_stdlib:
+                        print(
+                            f"Warning: {path} shadows standard library module "
+                            f"'{parts[0]}' imported by {file_path}"
+                        )
+                    module_paths.add(Path(path))
                     break
 
-        self.dependencies[file_path] = module_paths
-        for dep_path in module_paths:
-            self.process_file(dep_path)
+        return module_paths
 
     def topological_sort(self) -> None:
         """
-        Sort modules based on their dependencies using depth-first search.
+        Sort modules based on their dependencies using graphlib.TopologicalSorter.
 
         Detects circular dependencies and produces an ordering where dependencies
-        come before dependent modules.
+        come before dependent modules. The sort is iterative, so deep dependency
+        chains cannot exhaust the recursion limit. Each module's position in the
+        order is recorded in module_order, which build_chunk uses to order the
+        modules of a chunk.
 
         Raises:
             Exception: If a circular dependency is detected
         """
-        visited = set()
-        temp_mark = set()
-        order = []
-
-        def visit(node: Path):
-            if node in temp_mark:
-                raise Exception(f"Circular dependency detected involving {node}")
-            if node not in visited:
-                temp_mark.add(node)
-                for dep in self.dependencies.get(node, []):
-                    visit(dep)
-                temp_mark.remove(node)
-                visited.add(node)
-                order.append(node)
-
+        sorter = TopologicalSorter()
         for module in self.processed_files:
-            if module not in visited:
-                visit(module)
+            sorter.add(module, *self.dependencies.get(module, ()))
 
-        self.sorted_modules = order
+        try:
+            self.sorted_modules = list(sorter.static_order())
+            self.module_order = {
+                module: i for i, module in enumerate(self.sorted_modules)
+            }
+        except CycleError as e:
+            cycle = " -> ".join(str(module) for module in reversed(e.args[1]))
+            raise Exception(
+                f"Circular dependency detected involving {e.args[1][0]}: {cycle}"
+            ) from e
 
     def auto_generate_chunks(
         self, min_chunk_size: int = 2, similarity_threshold: float = 0.5
@@ -256,9 +323,12 @@ class Packer:
             min_chunk_size (int): Minimum number of modules to form a chunk
             similarity_threshold (float): Threshold for grouping modules (0.0 to 1.0)
         """
+        # Path.parent builds a new path object on every access, so each
+        # module's directory name is looked up once and shared by both passes
+        dir_names = {module: module.parent.name for module in self.processed_files}
+
         dir_groups = defaultdict(set)
-        for module in self.processed_files:
-            dir_name = module.parent.name
+        for module, dir_name in dir_names.items():
             dir_groups[dir_name].add(module)
 
         auto_chunks = []
@@ -277,7 +347,10 @@ class Packer:
                 chunk_config = ChunkConfig(
                     name=f"chunk_deps_{group_idx}",
                     entry_points=[next(iter(modules))],
-                    includes=[rf".*/{m.parent.name}/.*\.py" for m in modules],
+                    # Modules sharing a directory would repeat the same pattern
+                    includes=list(
+                        dict.fromkeys(rf".*/{dir_names[m]}/.*\.py" for m in modules)
+                    ),
                 )
                 auto_chunks.append(chunk_config)
 
@@ -287,12 +360,41 @@ class Packer:
         """
         Group modules based on their dependency relationships.
 
+        Dependencies and dependents are encoded as integer bitsets indexed by
+        module id, so each Jaccard similarity is a pair of bitwise operations
+        and popcounts instead of set construction.
+
         Args:
             similarity_threshold (float): Threshold for considering modules similar
 
         Returns:
             List[Set[Path]]: List of module groups
         """
+        module_ids: Dict[Path, int] = {}
+        for module in self.processed_files:
+            module_ids.setdefault(module, len(module_ids))
+            for dep in self.dependencies.get(module, set()):
+                module_ids.setdefault(dep, len(module_ids))
+
+        def to_bits(modules: Set[Path]) -> int:
+            bits = 0
+            for module in modules:
+                bits |= 1 << module_ids[module]
+            return bits
+
+        deps_bits = {
+            module: to_bits(self.dependencies.get(module, ()))
+            for module in self.processed_files
+        }
+        dependents_bits = {
+            module: to_bits(self.dependents.get(module, ()))
+            for module in self.processed_files
+        }
+
+        def jaccard(a: int, b: int) -> float:
+            union = (a | b).bit_count()
+            return (a & b).bit_count() / union if union else 0
+
         groups = []
         unassigned = set(self.processed_files)
 
@@ -300,37 +402,14 @@ class Packer:
             current = unassigned.pop()
             current_group = {current}
 
-            deps = self.dependencies.get(current, set())
-            dependents = {
-                m
-                for m in self.processed_files
-                if current in self.dependencies.get(m, set())
-            }
+            deps = deps_bits[current]
+            dependents = dependents_bits[current]
 
             for module in list(unassigned):
-                module_deps = self.dependencies.get(module, set())
-                module_dependents = {
-                    m
-                    for m in self.processed_files
-                    if module in self.dependencies.get(m, set())
-                }
-
-                deps_similarity = (
-                    len(deps & module_deps) / len(deps | module_deps)
-                    if deps or module_deps
-                    else 0
-                )
-
-                deps_flow_similarity = (
-                    len(dependents & module_dependents)
-                    / len(dependents | module_dependents)
-                    if dependents or module_dependents
-                    else 0
-                )
-
                 if (
-                    deps_similarity > similarity_threshold
-                    or deps_flow_similarity > similarity_threshold
+                    jaccard(deps, deps_bits[module]) > similarity_threshold
+                    or jaccard(dependents, dependents_bits[module])
+                    > similarity_threshold
                 ):
                     current_group.add(module)
                     unassigned.remove(module)
@@ -353,41 +432,50 @@ class Packer:
         #     print(colored("  ➜  Auto-generating chunk configuration", "blue"))
         #     self.auto_generate_chunks()
 
+        # Directory listings are only trusted for the duration of one run
+        self.module_cache.clear_directory_listings()
         self.process_file(self.entry_point)
         self.topological_sort()
 
         # Calculate original size before compression
-        original_size = 0
+        # One stat per module; missing files are skipped rather than probed first
+        original_bytes = 0
         for module in self.processed_files:
-            if module.exists():
-                original_size += os.path.getsize(module) / 1024
+            try:
+                original_bytes += os.stat(module).st_size
+            except OSError:
+                continue
+        original_size = original_bytes / 1024
 
-        # Put all modules in main chunk by default
+        # Put all modules in main chunk by default. The chunk gets its own copy
+        # of the set, since build_chunk records built modules in processed_files
         self.chunks["main"] = set(self.processed_files)
-        for module in self.processed_files:
-            self.module_to_chunk[module] = "main"
+        self.module_to_chunk.update(dict.fromkeys(self.processed_files, "main"))
 
         self.chunk_builder.processed_files = self.processed_files
 
         chunk_info = []
         total_size = 0
-        chunk_dependencies = {}
         valid_chunks = {}
         processed_modules = set()
 
-        chunk_processing_order = [name for name in self.chunks.keys() if name != "main"]
+        # Collected before building, since build_chunk may drop modules from a chunk
+        chunk_dependencies = self.get_all_chunk_imports()
 
+        # Main is built last since its loader header references the hashes of
+        # the other chunks
+        chunk_processing_order = [name for name in self.chunks.keys() if name != "main"]
         if "main" in self.chunks:
             chunk_processing_order.append("main")
 
         for chunk_name in chunk_processing_order:
-            if chunk_name not in self.chunks:
-                continue
-
             modules = self.chunks[chunk_name]
-            chunk_dependencies[chunk_name] = self.get_chunk_imports(chunk_name)
             chunk_path, hashed_filename = self.chunk_builder.build_chunk(
-                chunk_name, modules, self.sorted_modules, self.module_to_chunk
+                chunk_name,
+                modules,
+                self.sorted_modules,
+                self.module_to_chunk,
+                self.module_order,
             )
 
             if chunk_path is None:
@@ -396,7 +484,7 @@ class Packer:
             valid_chunks[chunk_name] = modules
             processed_modules.update(modules)
 
-            size = os.path.getsize(chunk_path) / 1024
+            size = self.chunk_builder.chunk_sizes[chunk_name] / 1024
             total_size += size
             chunk_info.append((chunk_name, hashed_filename, size))
 
@@ -413,12 +501,15 @@ class Packer:
         )
 
         build_time = time.time() - start_time
-        print(colored("\n✨ Build completed successfully!", "green"))
-        print(colored("\n📄  Output files:", "white", attrs=["bold"]))
+        # The report is collected and written in one call rather than line by line
+        report: List[str] = [
+            colored("\n✨ Build completed successfully!", "green"),
+            colored("\n📄  Output files:", "white", attrs=["bold"]),
+        ]
 
         for name, filename, size in chunk_info:
             size_text = f"{size:.2f} KB"
-            print(
+            report.append(
                 f"  {colored('➜', 'green')} {filename.ljust(40)} {colored(size_text, 'yellow')}"
             )
 
@@ -426,7 +517,7 @@ class Packer:
         compression_ratio = ((original_size - total_size) / original_size * 100) if original_size > 0 else 0
 
         # Format the statistics section with proper alignment matching output files
-        print(colored("\n📊  Compression Statistics:", "white", attrs=["bold"]))
+        report.append(colored("\n📊  Compression Statistics:", "white", attrs=["bold"]))
 
         # Use same column width as output files (40 characters)
         column_width = 40
@@ -441,12 +532,13 @@ class Packer:
 
         for label, value, color_name in stats:
             attrs = ["bold"] if label == "Compression:" else []
-            print(
+            report.append(
                 f"  {colored('➜', 'green')} {label.ljust(column_width)} {colored(value, color_name, attrs=attrs)}"
             )
 
-        print(
+        report.append(
             colored("\n📁  Output directory:", "white", attrs=["bold"])
             + " "
             + colored(str(self.output_dir) + "/", "blue")
         )
+        print("\n".join(report))